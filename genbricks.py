@@ -1,21 +1,30 @@
 import argparse
+import copy
+import logging
+import math
+import os
 import yaml
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Tuple, Optional
-import math
 
-@dataclass
+# Prefer the libyaml-backed loader when PyYAML was built with it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+logger = logging.getLogger(__name__)
+
+@dataclass(slots=True)
 class RandomSetting:
     enabled: bool = False
     strength: float = 0.0  # 0.0 to 1.0, how strong the randomness is applied
     range: Optional[Tuple[float, float]] = None  # (min, max) for the parameter
 
-@dataclass
+@dataclass(slots=True)
 class ParamWithRandom:
     value: any
     random: RandomSetting = field(default_factory=RandomSetting)
 
-@dataclass
+@dataclass(slots=True)
 class LegoBuildingConfig:
     length: ParamWithRandom = field(default_factory=lambda: ParamWithRandom(20))
     width: ParamWithRandom = field(default_factory=lambda: ParamWithRandom(15))
@@ -26,37 +35,53 @@ class LegoBuildingConfig:
     number_of_doors: ParamWithRandom = field(default_factory=lambda: ParamWithRandom(0))
     primary_brick_type: str = ""  # BrickLink part id
 
+def _pwr_from_dict(val):
+    """
+    Wrap a config value in ParamWithRandom, reading random settings
+    when the value is given as a dict.
+    """
+    if isinstance(val, dict) and 'value' in val:
+        # If config provides random settings, use them
+        random_cfg = val.get('random', {})
+        rng = random_cfg.get('range')
+        random_setting = RandomSetting(
+            enabled=random_cfg.get('enabled', False),
+            strength=random_cfg.get('strength', 0.0),
+            range=(rng[0], rng[1]) if rng is not None else None
+        )
+        return ParamWithRandom(val['value'], random_setting)
+    else:
+        # Just a value, wrap in ParamWithRandom with default random settings
+        return ParamWithRandom(val, RandomSetting())
+
 def createLegoBuildingConfig(config: dict) -> 'LegoBuildingConfig':
     """
     Create a LegoBuildingConfig instance from a config dict,
     wrapping values in ParamWithRandom as needed.
     """
-    def param_with_random_from_dict(val):
-        if isinstance(val, dict) and 'value' in val:
-            # If config provides random settings, use them
-            random_cfg = val.get('random', {})
-            random_setting = RandomSetting(
-                enabled=random_cfg.get('enabled', False),
-                strength=random_cfg.get('strength', 0.0),
-                range=tuple(random_cfg['range']) if 'range' in random_cfg else None
-            )
-            return ParamWithRandom(val['value'], random_setting)
-        else:
-            # Just a value, wrap in ParamWithRandom with default random settings
-            return ParamWithRandom(val, RandomSetting())
-
-    # Prepare kwargs for LegoBuildingConfig
+    # Prepare kwargs for LegoBuildingConfig, fields missing from the config
+    # keep their dataclass defaults
     kwargs = {}
-    for field_name in LegoBuildingConfig.__dataclass_fields__:
-        if field_name == "primary_brick_type":
-            # Not a ParamWithRandom, just assign directly
-            if field_name in config:
-                kwargs[field_name] = config[field_name]
-        else:
-            if field_name in config:
-                kwargs[field_name] = param_with_random_from_dict(config[field_name])
+    if "length" in config:
+        kwargs["length"] = _pwr_from_dict(config["length"])
+    if "width" in config:
+        kwargs["width"] = _pwr_from_dict(config["width"])
+    if "height" in config:
+        kwargs["height"] = _pwr_from_dict(config["height"])
+    if "window_size" in config:
+        kwargs["window_size"] = _pwr_from_dict(config["window_size"])
+    if "window_spacing" in config:
+        kwargs["window_spacing"] = _pwr_from_dict(config["window_spacing"])
+    if "door_size" in config:
+        kwargs["door_size"] = _pwr_from_dict(config["door_size"])
+    if "number_of_doors" in config:
+        kwargs["number_of_doors"] = _pwr_from_dict(config["number_of_doors"])
+    if "primary_brick_type" in config:
+        # Not a ParamWithRandom, just assign directly
+        kwargs["primary_brick_type"] = config["primary_brick_type"]
     return LegoBuildingConfig(**kwargs)
 
+@lru_cache(maxsize=16)
 def buildWall(length, height, primary_brick_type, window_size, window_spacing, door_size, num_doors):
     """
     Build a wall with windows and doors. The wall is built from left to right. 
@@ -65,17 +90,69 @@ def buildWall(length, height, primary_brick_type, window_size, window_spacing, d
     Windows are placed spaced evenly across the wall, avoiding the doors. 
     The primary brick type is used for the wall, with smaller bricks to fill in 
     gaps for doors and windows.
+
+    window_size and door_size are (width, height) tuples. Results are cached
+    by argument, so the wall is returned as a tuple of row tuples. The
+    placement debug output is only logged when a wall is first built, not
+    when it comes from the cache.
     """
-    print(f"Building wall of length {length}, height {height}, "
-          f"with primary brick type {primary_brick_type}.")
-    print(f"Window size: {window_size}, Window spacing: {window_spacing}, "
-          f"Door size: {door_size}, Number of front doors: {num_doors}")
+    logger.debug("Building wall of length %s, height %s, with primary brick type %s.",
+                 length, height, primary_brick_type)
+    logger.debug("Window size: %s, Window spacing: %s, Door size: %s, Number of front doors: %s",
+                 window_size, window_spacing, door_size, num_doors)
     
     brick_len = 2 # Assuming each brick has a length of 2 units
     window_base = 2 # The base row for windows
     
+    door_buffer = 4 # Buffer space before placing a door
+
+    # Unpack the parameter values once, outside the row loop
+    door_w, door_h = door_size
+    window_w, window_h = window_size
+    window_gap = window_spacing
+    window_top = window_base + window_h
+
+    # Doors start every length/num_doors units after the buffer, and windows
+    # every window_w + window_gap units after half a gap. Track the next
+    # candidate position as a counter scaled by num_doors (doors) and by 2
+    # (windows) so the comparisons stay exact integer checks.
+    has_doors = (num_doors > 0) and (length > 0) and (door_w > 0) and (door_h > 0)
+    has_windows = (window_w > 0) and (window_h > 0)
+    if has_doors:
+        first_door = (door_buffer * num_doors) % length
+    if has_windows:
+        # Windows repeat every |window_w + window_gap| units, the sign of the
+        # period doesn't change which positions match
+        window_period = abs(2 * (window_w + window_gap))
+        if window_period == 0:
+            if height > window_base and length > 0:
+                raise ValueError("window width plus window spacing must not be zero")
+            # No row reaches the window band, so there is nothing to place
+            has_windows = False
+    if has_windows:
+        first_window = window_gap % window_period
+
+    # Without doors or windows every row is a plain run of bricks
+    if not (has_doors or has_windows):
+        row_list = []
+        wall_loc = 0
+        while wall_loc < length:
+            row_list.append(("brick", wall_loc))
+            wall_loc += brick_len
+        return (tuple(row_list),) * max(0, height)
+
+    # Every placement advances at least min_step units, which bounds the
+    # number of entries in a row so the lists can be allocated up front
+    min_step = brick_len
+    if has_doors:
+        min_step = min(min_step, door_w)
+    if has_windows:
+        min_step = min(min_step, window_w)
+    row_cap = max(0, int(math.ceil(length / min_step)))
+
     # Build the wall
-    wall_list = []
+    wall_list = [None] * max(0, height)
+    row_cache = {}
     wall_loc = 0
     
     # Create rows of bricks, windows, and doors, starting from the bottom
@@ -85,39 +162,60 @@ def buildWall(length, height, primary_brick_type, window_size, window_spacing, d
     # door height, both windows and doors are placed. For rows above the
     # door height, only windows are placed.
     for row in range(height):
-        row_list = []
+        place_doors = has_doors and (row < door_h)
+        place_windows = has_windows and (row >= window_base) and (row < window_top)
+        # The layout of a row only depends on which features it crosses, so
+        # rows in the same door/window band reuse the first one built
+        row_key = (place_doors, place_windows)
+        if row_key in row_cache:
+            wall_list[row] = row_cache[row_key]
+            continue
+        row_list = [None] * row_cap
+        idx = 0
         front_doors_left = num_doors
-        door_buffer = 4 # Buffer space before placing a door
-        door_spacing = (float(length) / (float(num_doors))) if num_doors > 0 else 0.0
-        place_doors = (door_spacing > 0) and (door_size.value[0] > 0) and (door_size.value[1] > 0) and (row < door_size.value[1])
-        place_windows = (window_size.value[0] > 0) and (window_size.value[1] > 0) and (row >= window_base) and (row < (window_base + window_size.value[1]))
+        next_door = first_door if place_doors else 0
+        next_window = first_window if place_windows else 0
         # print(f"door_size: {door_size}, window_size: {window_size}, window_spacing: {window_spacing}")
         wall_loc = 0
         while wall_loc < length:
             # print(f"Current wall location: {wall_loc}")
-            door_start = place_doors and (((wall_loc - door_buffer) % door_spacing) == 0)
-            place_window = place_windows and (float(wall_loc - window_spacing.value/2) % float(window_size.value[0] + window_spacing.value) == 0)
+            door_start = False
+            if place_doors:
+                while next_door < wall_loc * num_doors:
+                    next_door += length
+                door_start = next_door == wall_loc * num_doors
+            place_window = False
+            if place_windows:
+                while next_window < 2 * wall_loc:
+                    next_window += window_period
+                place_window = next_window == 2 * wall_loc
             if (place_doors and (front_doors_left > 0) and door_start):
                 # Place a door
-                print(f"    Placing door at position {wall_loc}")
-                row_list.append(("door", wall_loc))
-                wall_loc += door_size.value[0]
+                logger.debug("    Placing door at position %s", wall_loc)
+                entry = ("door", wall_loc)
+                wall_loc += door_w
                 front_doors_left -= 1
             elif (place_windows and place_window):
                 # Place a window
-                print(f"    Placing window at position {wall_loc}")
-                row_list.append(("window", wall_loc))
-                wall_loc += window_size.value[0]
+                logger.debug("    Placing window at position %s", wall_loc)
+                entry = ("window", wall_loc)
+                wall_loc += window_w
             else: # Place a brick
-                print
-                row_list.append(("brick", wall_loc))
+                entry = ("brick", wall_loc)
                 wall_loc += brick_len
+            if idx < row_cap:
+                row_list[idx] = entry
+            else:
+                # Repeated float steps can fall short of k * min_step and
+                # fit one more entry than the computed bound
+                row_list.append(entry)
+            idx += 1
 
-        wall_list.append(row_list)
+        row_list = tuple(row_list[:idx])
+        row_cache[row_key] = row_list
+        wall_list[row] = row_list
 
-    print(f"Wall built: {wall_list}")
-
-    return wall_list
+    return tuple(wall_list)
 
 def generateSotBuilding(config: LegoBuildingConfig, random: bool = False):
     """
@@ -137,57 +235,69 @@ def generateSotBuilding(config: LegoBuildingConfig, random: bool = False):
     print(f"Window Size: {config.window_size.value}, Spacing: {config.window_spacing.value}")
     print(f"Door Size: {config.door_size.value}, Number of Doors: {config.number_of_doors.value}")
 
+    # Plain, hashable values so identical walls share buildWall's cache
+    window_size = tuple(config.window_size.value)
+    window_spacing = config.window_spacing.value
+    door_size = tuple(config.door_size.value)
+
+    # Spread the doors over the walls, rounding up with integer ceiling division
+    num_doors = config.number_of_doors.value
+
     ## Build Front Wall
-    num_front_doors = math.ceil(config.number_of_doors.value / 4)
+    num_front_doors = (num_doors + 3) // 4
     print("Front Wall:")
     front_wall = buildWall(
         config.length.value,
         config.height.value,
         config.primary_brick_type,
-        config.window_size,
-        config.window_spacing,
-        config.door_size,
+        window_size,
+        window_spacing,
+        door_size,
         num_front_doors
     )
+    logger.debug("Wall built: %s", front_wall)
 
     ## Build Back Wall
-    num_back_doors = math.ceil((config.number_of_doors.value - num_front_doors) / 3)
+    num_back_doors = (num_doors - num_front_doors + 2) // 3
     print("Back Wall:")
     back_wall = buildWall(
         config.length.value,
         config.height.value,
         config.primary_brick_type,
-        config.window_size,
-        config.window_spacing,
-        config.door_size,   
+        window_size,
+        window_spacing,
+        door_size,
         num_back_doors
     )
+    logger.debug("Wall built: %s", back_wall)
 
     ## Build Left Wall
-    num_left_doors = math.ceil((config.number_of_doors.value - num_front_doors - num_back_doors) / 2)
+    num_left_doors = (num_doors - num_front_doors - num_back_doors + 1) // 2
     print("Left Wall:")
     left_wall = buildWall(
         config.width.value,
         config.height.value,
         config.primary_brick_type,
-        config.window_size,
-        config.window_spacing,
-        config.door_size,
+        window_size,
+        window_spacing,
+        door_size,
         num_left_doors
     )
+    logger.debug("Wall built: %s", left_wall)
 
     ## Build Right Wall
-    num_right_doors = math.ceil((config.number_of_doors.value - num_front_doors - num_back_doors - num_left_doors) / 2)
+    num_right_doors = (num_doors - num_front_doors - num_back_doors - num_left_doors + 1) // 2
     print("Right Wall:")
     right_wall = buildWall(
         config.width.value,
         config.height.value,
         config.primary_brick_type,
-        config.window_size,
-        config.window_spacing,
-        config.door_size,
+        window_size,
+        window_spacing,
+        door_size,
         num_right_doors
     )
+    logger.debug("Wall built: %s", right_wall)
 
 def create_parser():
     parser = argparse.ArgumentParser(description="Gen Bricks.")
@@ -200,13 +310,26 @@ def create_parser():
                         default=False,
                         action='store_true',
                         help='Enable random generation')
+    parser.add_argument('-v', '--verbose',
+                        default=False,
+                        action='store_true',
+                        help='Print detailed wall placement output '
+                             '(placements are logged once per distinct wall)')
     return parser
 
+@lru_cache(maxsize=64)
+def _parse_config_cached(config_path, mtime_ns, size):
+    # mtime_ns and size are only part of the cache key, so an edited file
+    # gets re-parsed
+    with open(config_path, 'rb') as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
+
 def parse_config(config_path):
     if config_path is None:
         return {}
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f) or {}
+    st = os.stat(config_path)
+    # Hand out a copy so callers can't modify the cached result
+    return copy.deepcopy(_parse_config_cached(config_path, st.st_mtime_ns, st.st_size))
 
 def main(args):
     # Your main logic here
@@ -227,4 +350,6 @@ def main(args):
 if __name__ == "__main__":
     parser = create_parser()
     args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING,
+                        format="%(message)s")
     main(args)
\ No newline at end of file
@@ -0,0 +1,59 @@
+import pytest
+
+from genbricks import buildWall
+
+BRICK_ROW_12 = (("brick", 0), ("brick", 2), ("brick", 4), ("brick", 6), ("brick", 8), ("brick", 10))
+
+def test_door_spacing_uses_exact_arithmetic():
+    # 16 / 6 doors is not exact in floating point, so the old float modulo
+    # missed the second door at 4 + 3 * 16/6 = 12
+    wall = buildWall(16, 1, "3001", (0, 0), 0, (2, 6), 6)
+    assert wall == ((("brick", 0), ("brick", 2), ("door", 4), ("brick", 6),
+                     ("brick", 8), ("brick", 10), ("door", 12), ("brick", 14)),)
+
+def test_windows_in_window_band():
+    # Windows start half a gap in and repeat every width + gap, only on
+    # rows from the window base up to its height
+    wall = buildWall(12, 5, "3001", (2, 2), 4, (0, 0), 0)
+    window_row = (("brick", 0), ("window", 2), ("brick", 4), ("brick", 6), ("window", 8), ("brick", 10))
+    assert wall == (BRICK_ROW_12, BRICK_ROW_12, window_row, window_row, BRICK_ROW_12)
+
+def test_doors_and_windows():
+    wall = buildWall(12, 4, "3001", (2, 2), 4, (3, 3), 1)
+    door_row = (("brick", 0), ("brick", 2), ("door", 4), ("brick", 7), ("brick", 9), ("brick", 11))
+    assert wall[:2] == (door_row, door_row)
+    assert wall[2] == (("brick", 0), ("window", 2), ("door", 4), ("brick", 7), ("brick", 9), ("brick", 11))
+    assert wall[3] == (("brick", 0), ("window", 2), ("brick", 4), ("brick", 6), ("window", 8), ("brick", 10))
+
+def test_all_brick_wall():
+    assert buildWall(12, 3, "3001", (0, 0), 0, (0, 0), 0) == (BRICK_ROW_12,) * 3
+
+def test_negative_window_period():
+    # A period of -2 matches the same positions as a period of 2
+    wall = buildWall(12, 3, "3001", (2, 2), -4, (0, 0), 0)
+    assert wall[:2] == (BRICK_ROW_12, BRICK_ROW_12)
+    assert wall[2] == tuple(("window", loc) for loc in range(0, 12, 2))
+
+def test_zero_window_period_raises():
+    with pytest.raises(ValueError):
+        buildWall(12, 3, "3001", (2, 2), -2, (0, 0), 0)
+    # Only an error when a row reaches the window band
+    assert buildWall(12, 1, "3001", (2, 2), -2, (0, 0), 0) == (BRICK_ROW_12,)
+
+def test_float_length_and_widths():
+    wall = buildWall(16.5, 3, "x", (2, 2), 1, (4, 6), 1)
+    assert wall[0] == (("brick", 0), ("brick", 2), ("door", 4), ("brick", 8), ("brick", 10),
+                       ("brick", 12), ("brick", 14), ("brick", 16))
+    wall = buildWall(10, 3, "x", (1.5, 2), 4, (0, 0), 0)
+    assert wall[2] == (("brick", 0), ("window", 2), ("brick", 3.5), ("brick", 5.5),
+                       ("window", 7.5), ("brick", 9))
+
+def test_all_brick_wall_float_length():
+    assert buildWall(7.5, 2, "x", (0, 0), 0, (0, 0), 0) == ((("brick", 0), ("brick", 2), ("brick", 4), ("brick", 6)),) * 2
+
+def test_float_widths_past_row_capacity():
+    # 7 steps of 1.1 add up to slightly less than 7.7, so the row holds one
+    # more window than length / width suggests
+    wall = buildWall(7.7, 3, "x", (1.1, 2), 0, (0, 0), 0)
+    assert len(wall[2]) == 8
+    assert all(kind == "window" for kind, _ in wall[2])